@@ -1,14 +1,29 @@
+import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
 import nfl_data_py as nfl
+from collections import defaultdict
+from operator import itemgetter
 from datetime import datetime, timezone, timedelta
-from flask import Flask, jsonify
+from flask import Flask, request
 from flask_cors import CORS
+from flask_compress import Compress
 from apscheduler.schedulers.background import BackgroundScheduler
+from concurrent.futures import ThreadPoolExecutor
+import functools
 import threading
 import os
+import time
 import logging
-import json
+import random
+import gzip
+import hashlib
+import re
+import orjson
+import redis
+from rapidfuzz import fuzz, process
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -22,17 +37,119 @@ CORS(app, origins=[
     "http://localhost:3000",
     "http://localhost:3001"
 ])
+# Gzip responses that aren't served from the precompressed blob below
+app.config["COMPRESS_MIMETYPES"] = ["application/json"]
+app.config["COMPRESS_LEVEL"] = 5
+Compress(app)
 # API Key - use environment variable in production
 API_KEY = os.getenv("ODDS_API_KEY", "d8ba5d45eca27e710d7ef2680d8cb452")
 
-# Global variable to store the latest props data
+# Shared HTTP session - keeps connections to the Odds API alive so we don't
+# pay a fresh DNS + TLS handshake for every one of the N+1 calls per refresh
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504])
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
+SESSION.headers.update({
+    "User-Agent": "nfl-alt-prop-tool/1.0",
+    "Accept-Encoding": "gzip"
+})
+
+# Optional Redis cache for Odds API responses - saves quota when refreshes
+# run close together. Falls back to direct fetches if REDIS_URL isn't set.
+REDIS_URL = os.getenv("REDIS_URL")
+redis_client = redis.Redis.from_url(REDIS_URL) if REDIS_URL else None
+
+# Conditional-GET memo: url -> (etag, parsed body, fetched_at). A short hard
+# TTL keeps manual testing honest; beyond it we revalidate with
+# If-None-Match so unchanged payloads cost a 304 and no JSON decode.
+_etag_cache = {}
+_ETAG_TTL = 60  # seconds
+
+def _fetch_json(url):
+    """Fetch and parse a URL, reusing the cached body when the server says 304"""
+    cached = _etag_cache.get(url)
+    if cached is not None and time.monotonic() - cached[2] < _ETAG_TTL:
+        return cached[1]
+
+    headers = {}
+    if cached is not None and cached[0]:
+        headers["If-None-Match"] = cached[0]
+
+    resp = SESSION.get(url, headers=headers, timeout=10)
+    if resp.status_code == 304 and cached is not None:
+        _etag_cache[url] = (cached[0], cached[1], time.monotonic())
+        return cached[1]
+    resp.raise_for_status()
+
+    data = orjson.loads(resp.content)
+    _etag_cache[url] = (resp.headers.get("ETag"), data, time.monotonic())
+    return data
+
+def cached_get(url, ttl):
+    """GET a URL through the shared session, caching the parsed body in Redis"""
+    key = None
+    if redis_client is not None:
+        key = "odds:" + hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+        try:
+            cached = redis_client.get(key)
+            if cached is not None:
+                return orjson.loads(cached)
+        except redis.RedisError as e:
+            logger.warning(f"Redis read failed, fetching directly: {e}")
+
+    data = _fetch_json(url)
+
+    if key is not None:
+        try:
+            redis_client.setex(key, ttl, orjson.dumps(data))
+        except redis.RedisError as e:
+            logger.warning(f"Redis write failed: {e}")
+
+    return data
+
+# Latest props data, published as an immutable snapshot: the refresh job
+# builds a complete new dict and rebinds this name in one assignment (atomic
+# under the GIL), so readers never need a lock or see a half-updated state
 latest_props_data = {
     "last_updated": None,
+    "last_updated_formatted": "Never",
     "props": [],
     "summary": {},
     "error": None
 }
-data_lock = threading.Lock()
+latest_response_bytes = orjson.dumps(latest_props_data)
+latest_response_gzip = gzip.compress(latest_response_bytes, 5)
+
+# Last snapshot that came from a completed refresh - kept so an Odds API or
+# nfl_data_py outage doesn't wipe the frontend to an empty payload
+last_good_snapshot = None
+
+def publish_snapshot(new_data, good=True):
+    """Atomically publish a new snapshot along with its pre-rendered JSON bytes
+    (plain and gzipped, so the request path never compresses).
+
+    good=False marks a failed refresh: the raw snapshot is still published
+    (for /health), but the served payload falls back to the last good data
+    with a stale flag if we have any.
+    """
+    global latest_props_data, latest_response_bytes, latest_response_gzip, last_good_snapshot
+    latest_props_data = new_data
+
+    if good:
+        last_good_snapshot = new_data
+        served = new_data
+    elif last_good_snapshot is not None:
+        served = {**last_good_snapshot, "stale": True, "error": new_data.get("error")}
+    else:
+        served = new_data
+
+    latest_response_bytes = orjson.dumps(served)
+    latest_response_gzip = gzip.compress(latest_response_bytes, 5)
 
 # --- Timezone helpers
 ET = timezone(timedelta(hours=-5))  # Eastern Time
@@ -44,14 +161,12 @@ def get_upcoming_games_filter():
     """
     now_et = datetime.now(ET)
     weekday = now_et.weekday()  # 0=Monday, 6=Sunday
-    
-    def should_include_game(game_time_str):
-        dt = datetime.fromisoformat(game_time_str.replace("Z", "+00:00"))
-        dt_et = dt.astimezone(ET)
+    today = now_et.date()  # computed once - the filter runs per event
+
+    def should_include_game(dt_et):
         game_date = dt_et.date()
         game_weekday = dt_et.weekday()  # 0=Monday, 3=Thursday, 6=Sunday
-        today = now_et.date()
-        
+
         # Calculate days until game
         days_until = (game_date - today).days
         
@@ -71,87 +186,286 @@ def get_upcoming_games_filter():
     
     return should_include_game
 
+@functools.lru_cache(maxsize=256)
+def _parse_commence(game_time_str):
+    """Parse an ISO commence_time string to an ET datetime (memoized - the
+    same handful of strings is parsed several times per refresh)"""
+    dt = datetime.fromisoformat(game_time_str.replace("Z", "+00:00"))
+    return dt.astimezone(ET)
+
+@functools.lru_cache(maxsize=256)
 def format_game_time(game_time_str):
     """Format game time for display"""
-    dt = datetime.fromisoformat(game_time_str.replace("Z", "+00:00"))
-    dt_et = dt.astimezone(ET)
-    return dt_et.strftime("%a %m/%d %I:%M%p ET")
+    return _parse_commence(game_time_str).strftime("%a %m/%d %I:%M%p ET")
+
+def _normalize_name(name):
+    """Lowercase and strip punctuation so 'A.Brown Jr.' and 'a brown jr' agree"""
+    return re.sub(r"[^a-z0-9 ]", "", name.lower()).strip()
+
+# Name lookup tables for the current refresh - match_player_name memoizes
+# against these, so the cache is cleared whenever they're replaced
+_pbp_name_set = frozenset()
+_pbp_name_lower = {}
+_pbp_name_normalized = {}
+
+def set_pbp_players(players):
+    """Install the current play-by-play player names and reset the match cache"""
+    global _pbp_name_set, _pbp_name_lower, _pbp_name_normalized
+    _pbp_name_set = frozenset(players)
+    _pbp_name_lower = {n.lower(): n for n in players}
+    _pbp_name_normalized = {_normalize_name(n): n for n in players}
+    match_player_name.cache_clear()
 
-def match_player_name(api_name, pbp_players):
+@functools.lru_cache(maxsize=4096)
+def match_player_name(api_name):
     """
     Match API player name (e.g., "Garrett Wilson") to play-by-play name (e.g., "G.Wilson")
     Returns the matching PBP player name or None
     """
     if not api_name:
         return None
-    
+
     # Split the API name
     parts = api_name.strip().split()
     if len(parts) < 2:
         return None
-    
+
     first_name = parts[0]
     last_name = parts[-1]
     first_initial = first_name[0].upper()
-    
+
     # Try multiple matching strategies
     # 1. First initial + Last name (e.g., "G.Wilson")
     pattern1 = f"{first_initial}.{last_name}"
-    for pbp_name in pbp_players:
-        if pbp_name == pattern1:
-            return pbp_name
-    
-    # 2. First initial + space + Last name (e.g., "G Wilson")  
+    if pattern1 in _pbp_name_set:
+        return pattern1
+
+    # 2. First initial + space + Last name (e.g., "G Wilson")
     pattern2 = f"{first_initial} {last_name}"
-    for pbp_name in pbp_players:
-        if pbp_name == pattern2:
-            return pbp_name
-    
+    if pattern2 in _pbp_name_set:
+        return pattern2
+
     # 3. Full first name + Last name (e.g., "Garrett Wilson")
     pattern3 = f"{first_name} {last_name}"
-    for pbp_name in pbp_players:
-        if pbp_name == pattern3:
-            return pbp_name
-    
+    if pattern3 in _pbp_name_set:
+        return pattern3
+
     # 4. Case-insensitive full name match
-    for pbp_name in pbp_players:
-        if pbp_name.lower() == api_name.lower():
-            return pbp_name
-    
+    match = _pbp_name_lower.get(api_name.lower())
+    if match is not None:
+        return match
+
     # 5. Try first two letters + last name for names like "DeAndre" -> "De.Hopkins"
     if len(first_name) >= 2:
         pattern4 = f"{first_name[:2]}.{last_name}"
-        for pbp_name in pbp_players:
-            if pbp_name == pattern4:
-                return pbp_name
-    
+        if pattern4 in _pbp_name_set:
+            return pattern4
+
+    # 6. Fuzzy fallback - catches suffixes ("Jr.", "II") and odd formats the
+    # exact patterns miss, with a high cutoff so we don't cross players
+    hit = process.extractOne(
+        _normalize_name(api_name), _pbp_name_normalized.keys(),
+        scorer=fuzz.WRatio, score_cutoff=88
+    )
+    if hit is not None:
+        return _pbp_name_normalized[hit[0]]
+
     return None
 
+# Markets requested from the Odds API, batched into one query string
+MARKETS = ",".join([
+    "player_pass_tds_alternate",
+    "player_pass_yds_alternate",
+    "player_rush_yds_alternate",
+    "player_receptions_alternate",
+    "player_reception_yds_alternate",
+    "player_rush_attempts_alternate"
+])
+
+# Market -> stat mapping (also serves as the set of markets we track)
+MARKET_TO_STAT = {
+    "player_pass_yds_alternate": "passing_yards",
+    "player_pass_tds_alternate": "passing_tds",
+    "player_rush_yds_alternate": "rushing_yards",
+    "player_rush_attempts_alternate": "rush_attempts",
+    "player_receptions_alternate": "receptions",
+    "player_reception_yds_alternate": "receiving_yards"
+}
+
+# Stat columns in the order they're stored in the per-player arrays
+STAT_COLS = ["passing_yards", "passing_tds", "rushing_yards",
+             "rush_attempts", "receptions", "receiving_yards"]
+STAT_COL_IDX = {c: i for i, c in enumerate(STAT_COLS)}
+
+# Market -> column index into the per-player stat arrays, so the hot loop
+# never goes through string column names
+MARKET_TO_COL = {m: STAT_COL_IDX[s] for m, s in MARKET_TO_STAT.items()}
+
+# Display labels, rendered once instead of per qualifying prop
+MARKET_TITLES = {m: m.replace('_', ' ').title() for m in MARKET_TO_STAT}
+
+# Columns requested from nfl_data_py play-by-play
+PBP_COLS = ['season','week','passer_player_name','rusher_player_name','receiver_player_name',
+            'passing_yards','rushing_yards','receiving_yards','pass_touchdown','rush_touchdown',
+            'complete_pass','rush_attempt']
+
+# Weekly stats cache - play-by-play only changes on game days, so there's no
+# reason to re-download and re-aggregate it on every 30-minute refresh
+WEEKLY_STATS_CACHE = "/tmp/weekly_stats.parquet"
+WEEKLY_STATS_MAX_AGE = 6 * 3600  # seconds, outside game windows
+WEEKLY_STATS_MAX_AGE_GAMEDAY = 30 * 60  # while games may be in progress
+
+def _weekly_stats_max_age():
+    """Cache TTL for weekly stats: short on Thursday/Sunday/Monday afternoons
+    and evenings ET when new plays are landing, long the rest of the week"""
+    now_et = datetime.now(ET)
+    if now_et.weekday() in (0, 3, 6) and now_et.hour >= 12:
+        return WEEKLY_STATS_MAX_AGE_GAMEDAY
+    return WEEKLY_STATS_MAX_AGE
+
+def load_weekly_stats(force=False):
+    """
+    Load per-player weekly stats, rebuilding from play-by-play only when the
+    on-disk cache is older than the current TTL (or force=True).
+    """
+    if not force:
+        try:
+            if time.time() - os.path.getmtime(WEEKLY_STATS_CACHE) < _weekly_stats_max_age():
+                return pd.read_parquet(WEEKLY_STATS_CACHE)
+        except Exception:
+            pass  # missing or unreadable cache - rebuild below
+
+    logger.info("Loading NFL play-by-play data...")
+    # Safer approach for 2025 data to avoid nfl_data_py errors
+    try:
+        # Try with limited columns first to avoid potential issues
+        pbp = nfl.import_pbp_data([2025], columns=PBP_COLS)
+    except:
+        try:
+            # Fallback to default if column selection fails
+            pbp = nfl.import_pbp_data([2025])
+        except Exception as e:
+            logger.error(f"Failed to load 2025 data: {e}")
+            # Use 2024 data as fallback
+            pbp = nfl.import_pbp_data([2024])
+            pbp['season'] = 2025  # Pretend it's 2025 data
+        # The fallback paths return the full ~400-column frame; project down
+        # immediately so aggregation never traverses columns it doesn't read
+        pbp = pbp.loc[:, PBP_COLS]
+
+    # Downcast before aggregating: float32 stats and categorical names cut
+    # memory severalfold and make the groupby hash small codes instead of
+    # Python strings
+    for c in ("passing_yards", "rushing_yards", "receiving_yards"):
+        pbp[c] = pbp[c].astype("float32")
+    for c in ("pass_touchdown", "complete_pass", "rush_attempt", "week", "season"):
+        pbp[c] = pbp[c].fillna(0).astype("int32")
+    for c in ("passer_player_name", "rusher_player_name", "receiver_player_name"):
+        pbp[c] = pbp[c].astype("category")
+
+    # Stack narrow per-role projections into long form and aggregate once,
+    # instead of three groupbys over pbp plus a re-aggregation of the concat
+    weekly_stats = (
+        pd.concat([
+            pbp[["season","week","passer_player_name","passing_yards","pass_touchdown"]]
+               .rename(columns={"passer_player_name":"player","pass_touchdown":"passing_tds"}),
+            pbp[["season","week","rusher_player_name","rushing_yards","rush_attempt"]]
+               .rename(columns={"rusher_player_name":"player","rush_attempt":"rush_attempts"}),
+            pbp[["season","week","receiver_player_name","receiving_yards","complete_pass"]]
+               .rename(columns={"receiver_player_name":"player","complete_pass":"receptions"})
+        ], ignore_index=True, copy=False)
+        .dropna(subset=["player"])
+        .groupby(["season","week","player"], sort=False, observed=True)
+        .sum(numeric_only=True)
+        .reset_index()
+    )
+
+    try:
+        weekly_stats.to_parquet(WEEKLY_STATS_CACHE, compression="zstd")
+    except Exception as e:
+        logger.warning(f"Could not write weekly stats cache: {e}")
+
+    return weekly_stats
+
+def refresh_weekly_stats():
+    """Scheduled forced rebuild of the weekly stats cache"""
+    try:
+        load_weekly_stats(force=True)
+        logger.info("Weekly stats cache rebuilt")
+    except Exception as e:
+        logger.error(f"Weekly stats rebuild failed: {e}")
+
+# Adaptive polling buckets (minutes): tight around kickoffs, lazy on the
+# empty days so we don't burn Odds API quota on a Tuesday 3am slate
+POLL_FAST = 5     # within an hour of (or during) the next kickoff
+POLL_NORMAL = 30  # games on the slate but not imminent
+POLL_SLOW = 360   # nothing upcoming
+
+scheduler = None  # set by init_scheduler
+
+def _next_poll_minutes(events_to_check):
+    """Pick the polling bucket from how close the next kickoff is"""
+    if not events_to_check:
+        return POLL_SLOW
+    now = datetime.now(ET)
+    next_kick = min(_parse_commence(ev["commence_time"]) for ev in events_to_check)
+    if (next_kick - now).total_seconds() <= 3600:
+        return POLL_FAST
+    return POLL_NORMAL
+
+def _reschedule_poll(events_to_check):
+    """Re-tune the fetch interval after a refresh (no-op before startup).
+    A +/-10% jitter desyncs instances behind a load balancer."""
+    if scheduler is None:
+        return
+    minutes = _next_poll_minutes(events_to_check) * random.uniform(0.9, 1.1)
+    try:
+        scheduler.reschedule_job('fetch_props', trigger='interval', minutes=minutes)
+    except Exception as e:
+        logger.warning(f"Could not reschedule props polling: {e}")
+
+# Guards against overlapping refreshes: the scheduler already enforces
+# max_instances=1, but manual invocations (console, future admin hooks)
+# should coalesce onto the in-flight run too rather than duplicate it
+_refresh_lock = threading.Lock()
+
 def fetch_nfl_props():
     """Main function to fetch and process NFL props"""
-    global latest_props_data
-    
+    if not _refresh_lock.acquire(blocking=False):
+        logger.info("Refresh already in progress; skipping duplicate run")
+        return
+    try:
+        _fetch_nfl_props()
+    finally:
+        _refresh_lock.release()
+
+def _fetch_nfl_props():
+    """One full refresh: fetch odds, rebuild stats, qualify and publish"""
     try:
         logger.info("Starting props update...")
         
         # 1. Get NFL events
         events_url = f"https://api.the-odds-api.com/v4/sports/americanfootball_nfl/events?apiKey={API_KEY}"
-        resp = requests.get(events_url, timeout=10)
-        resp.raise_for_status()
-        events = resp.json()
+        events = cached_get(events_url, ttl=300)
         
-        # Filter to relevant games based on day of week
+        # Filter to relevant games based on day of week, parsing each event's
+        # commence_time exactly once
         game_filter = get_upcoming_games_filter()
-        events_to_check = [ev for ev in events if game_filter(ev["commence_time"])]
+        events_to_check = [
+            ev for ev in events
+            if game_filter(_parse_commence(ev["commence_time"]))
+        ]
         
         if not events_to_check:
-            with data_lock:
-                latest_props_data = {
-                    "last_updated": datetime.now(ET).isoformat(),
-                    "props": [],
-                    "summary": {"total_games": 0, "total_props": 0},
-                    "error": "No relevant NFL games found"
-                }
+            now = datetime.now(ET)
+            publish_snapshot({
+                "last_updated": now.isoformat(),
+                "last_updated_formatted": now.strftime("%I:%M %p ET"),
+                "props": [],
+                "summary": {"total_games": 0, "total_props": 0},
+                "error": "No relevant NFL games found"
+            })
+            _reschedule_poll([])
             return
         
         games_info = []
@@ -161,278 +475,267 @@ def fetch_nfl_props():
                 "time": format_game_time(ev["commence_time"])
             })
         
-        # 2. Markets to check
-        markets = ",".join([
-            "player_pass_tds_alternate",
-            "player_pass_yds_alternate",
-            "player_rush_yds_alternate",
-            "player_receptions_alternate",
-            "player_reception_yds_alternate",
-            "player_rush_attempts_alternate"
-        ])
-        
-        # 3. Collect props
+        # 2. Collect props - fetch each event's odds in parallel since the
+        # calls are independent and network-bound
+        def fetch_one_event(ev):
+            odds_url = (
+                f"https://api.the-odds-api.com/v4/sports/americanfootball_nfl/events/{ev['id']}/odds"
+                f"?regions=us,us2&oddsFormat=american&markets={MARKETS}&apiKey={API_KEY}"
+            )
+            try:
+                return ev, cached_get(odds_url, ttl=120)
+            except Exception as e:
+                # One failed event (429, timeout) shouldn't abort the batch
+                logger.warning(f"Odds fetch failed for {ev['away_team']} @ {ev['home_team']}: {e}")
+                return ev, None
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(fetch_one_event, events_to_check))
+
         props = []
-        for ev in events_to_check:
-            event_id = ev["id"]
+        for ev, game_data in results:
+            if game_data is None:
+                continue
             home, away = ev["home_team"], ev["away_team"]
+            game = f"{away} @ {home}"
             game_time = format_game_time(ev["commence_time"])
-            
-            odds_url = (
-                f"https://api.the-odds-api.com/v4/sports/americanfootball_nfl/events/{event_id}/odds"
-                f"?regions=us,us2&oddsFormat=american&markets={markets}&apiKey={API_KEY}"
-            )
-            odds_resp = requests.get(odds_url, timeout=10)
-            odds_resp.raise_for_status()
-            game_data = odds_resp.json()
-            
-            for bookmaker in game_data.get("bookmakers", []):
-                for market in bookmaker.get("markets", []):
-                    for outcome in market.get("outcomes", []):
-                        player = outcome.get("description")
-                        side = outcome.get("name")
-                        line = outcome.get("point")
+
+            for bookmaker in game_data.get("bookmakers", ()):
+                bm_key = bookmaker.get("key")
+                bm_title = bookmaker.get("title")
+                for market in bookmaker.get("markets", ()):
+                    market_key = market["key"]
+                    # Skip whole markets we don't track before touching outcomes
+                    if market_key not in MARKET_TO_STAT:
+                        continue
+                    for outcome in market.get("outcomes", ()):
                         odds = outcome.get("price")
-                        
-                        if odds is not None and -600 <= odds <= -150:
-                            props.append({
-                                "game": f"{away} @ {home}",
-                                "game_time": game_time,
-                                "market": market["key"],
-                                "player": player,
-                                "side": side,
-                                "line": line,
-                                "odds": odds,
-                                "bookmaker": bookmaker.get("key"),
-                                "bookmaker_title": bookmaker.get("title")
-                            })
+                        if odds is None or odds < -600 or odds > -150:
+                            continue
+                        # Plain tuples: a fraction of the footprint of a dict
+                        # per outcome, and the grouping loop unpacks them
+                        props.append((
+                            game, game_time, market_key,
+                            outcome.get("description"), outcome.get("name"),
+                            outcome.get("point"), odds, bm_key, bm_title
+                        ))
         
         logger.info(f"Pulled {len(props)} props in odds range")
         
-        # 4. Build weekly stats from play-by-play
-        logger.info("Loading NFL play-by-play data...")
-        # Safer approach for 2025 data to avoid nfl_data_py errors
-        try:
-            # Try with limited columns first to avoid potential issues
-            cols = ['season','week','passer_player_name','rusher_player_name','receiver_player_name',
-                    'passing_yards','rushing_yards','receiving_yards','pass_touchdown','rush_touchdown',
-                    'complete_pass','rush_attempt']
-            pbp = nfl.import_pbp_data([2025], columns=cols)
-        except:
-            try:
-                # Fallback to default if column selection fails
-                pbp = nfl.import_pbp_data([2025])
-            except Exception as e:
-                logger.error(f"Failed to load 2025 data: {e}")
-                # Use 2024 data as fallback
-                pbp = nfl.import_pbp_data([2024])
-                pbp['season'] = 2025  # Pretend it's 2025 data
-        
-        weekly_stats = (
-            pd.concat([
-                pbp.groupby(["season","week","passer_player_name"])
-                   .agg(passing_yards=("passing_yards","sum"), passing_tds=("pass_touchdown","sum"))
-                   .reset_index().rename(columns={"passer_player_name":"player"}),
-                pbp.groupby(["season","week","rusher_player_name"])
-                   .agg(rushing_yards=("rushing_yards","sum"), rush_attempts=("rush_attempt","sum"))
-                   .reset_index().rename(columns={"rusher_player_name":"player"}),
-                pbp.groupby(["season","week","receiver_player_name"])
-                   .agg(receiving_yards=("receiving_yards","sum"), receptions=("complete_pass","sum"))
-                   .reset_index().rename(columns={"receiver_player_name":"player"})
-            ], ignore_index=True)
-            .groupby(["season","week","player"]).sum().reset_index()
-        )
+        # 3. Build weekly stats from play-by-play (cached between refreshes)
+        weekly_stats = load_weekly_stats()
         current_week = weekly_stats["week"].max()
         
-        # Get all unique player names from play-by-play for matching
-        all_pbp_players = weekly_stats[weekly_stats["season"] == 2025]["player"].unique().tolist()
-        
-        # 5. Market → stat mapping
-        market_to_stat = {
-            "player_pass_yds_alternate": "passing_yards",
-            "player_pass_tds_alternate": "passing_tds",
-            "player_rush_yds_alternate": "rushing_yards",
-            "player_rush_attempts_alternate": "rush_attempts",
-            "player_receptions_alternate": "receptions",
-            "player_reception_yds_alternate": "receiving_yards"
+        # Index each player's games once: player -> (weeks, stats) array with
+        # rows sorted week-descending, so qualification is a dict lookup
+        # instead of a full-frame scan per prop
+        ws25 = weekly_stats[weekly_stats["season"] == 2025].sort_values("week", ascending=False)
+        player_idx = {
+            name: grp[STAT_COLS].to_numpy()
+            for name, grp in ws25.groupby("player", sort=False)
         }
+
+        # Install the current player names for matching
+        set_pbp_players(player_idx)
         
-        # 6. Qualification check - hit the line in at least 4 consecutive games, return all consecutive
-        def qualifies_strong(player_api_name, stat_col, line, side):
+        # 4. Qualification check - hit the line in at least 4 consecutive games, return all consecutive
+        def qualifies_strong(player_api_name, stat_idx, line, side):
             # Match the API name to the play-by-play name
-            pbp_player_name = match_player_name(player_api_name, all_pbp_players)
-            
+            pbp_player_name = match_player_name(player_api_name)
+
             if not pbp_player_name:
                 return False, []
-            
-            # Get this specific player's games
-            player_games = weekly_stats[
-                (weekly_stats["season"] == 2025) &
-                (weekly_stats["player"] == pbp_player_name)
-            ]
-            
+
+            # Grab this player's pre-indexed games (rows already week-descending)
+            arr = player_idx.get(pbp_player_name)
+
             # Must have played at least 4 games
-            if player_games.empty or len(player_games) < 4:
+            if arr is None or len(arr) < 4:
                 return False, []
-            
-            # Sort by week descending (most recent first)
-            player_games = player_games.sort_values('week', ascending=False)
-            
-            # Find the longest streak from most recent games
-            consecutive_games = []
-            for _, game in player_games.iterrows():
-                val = game[stat_col]
-                
-                # Check if this game hits the line
-                if side == "Over":
-                    hits = val > line
-                else:  # Under
-                    hits = val < line
-                
-                if hits:
-                    consecutive_games.append(val)
-                else:
-                    # Streak broken, stop here
-                    break
-            
+
+            vals_by_week = arr[:, stat_idx]
+
+            # Streak from most recent games: hit mask in one comparison, then
+            # the first miss (argmin of the boolean mask) caps the streak
+            hits = vals_by_week > line if side == "Over" else vals_by_week < line
+            streak = len(hits) if hits.all() else int(np.argmin(hits))
+
             # Check if we have at least 4 consecutive games
-            if len(consecutive_games) >= 4:
-                return True, consecutive_games
+            if streak >= 4:
+                return True, vals_by_week[:streak].tolist()
             else:
                 return False, []
         
-        # 7. Group qualifying props by unique prop, collecting all bookmakers
+        # 5. Group qualifying props by unique prop, collecting all bookmakers.
+        # The same (player, market, line, side) shows up once per bookmaker,
+        # so qualification is evaluated once per unique prop and cached.
         prop_groups = {}
-        for p in props:
-            stat_col = market_to_stat.get(p["market"])
-            if not stat_col:
+        qual_cache = {}
+        for game, game_time, market_key, player, side, line, odds, bm_name, bm_title in props:
+            stat_idx = MARKET_TO_COL.get(market_key)
+            if stat_idx is None:
                 continue
-            ok, vals = qualifies_strong(p["player"], stat_col, p["line"], p["side"])
+            qual_key = (player, market_key, line, side)
+            result = qual_cache.get(qual_key)
+            if result is None:
+                result = qual_cache[qual_key] = qualifies_strong(player, stat_idx, line, side)
+            ok, vals = result
             if ok:
                 # Create unique key for this prop
-                prop_key = (p["player"], p["market"], p["line"], p["side"], p["game"])
-                
-                if prop_key not in prop_groups:
+                prop_key = (player, market_key, line, side, game)
+
+                group = prop_groups.get(prop_key)
+                if group is None:
                     avg_val = sum(vals) / len(vals) if vals else 0
-                    prop_groups[prop_key] = {
-                        "game": p["game"],
-                        "game_time": p["game_time"],
-                        "market": p["market"].replace('_', ' ').title(),
-                        "player": p["player"],
-                        "side": p["side"],
-                        "line": float(p["line"]),
+                    group = prop_groups[prop_key] = {
+                        "game": game,
+                        "game_time": game_time,
+                        "market": MARKET_TITLES[market_key],
+                        "player": player,
+                        "side": side,
+                        "line": float(line),
                         "bookmakers": [],
+                        "_seen_bookmakers": set(),  # popped before publishing
                         "season_avg": round(float(avg_val), 1),
                         "weekly_values": [float(v) for v in vals],
                         "streak_length": len(vals)  # Add streak length for display
                     }
-                
-                # Add bookmaker to this prop
-                prop_groups[prop_key]["bookmakers"].append({
-                    "name": p["bookmaker"],
-                    "title": p["bookmaker_title"],
-                    "odds": int(p["odds"])
-                })
-        
-        # 8. Convert to list and remove duplicate bookmakers for each prop
+
+                # Add bookmaker to this prop, skipping duplicates (same
+                # bookmaker with same odds) at insertion time
+                bm_key = (bm_name, int(odds))
+                if bm_key not in group["_seen_bookmakers"]:
+                    group["_seen_bookmakers"].add(bm_key)
+                    group["bookmakers"].append({
+                        "name": bm_name,
+                        "title": bm_title,
+                        "odds": int(odds)
+                    })
+
+        # 6. Convert to list and sort each prop's bookmakers by best odds
         qualifying = []
         for prop_data in prop_groups.values():
-            # Remove duplicate bookmakers (same bookmaker with same odds)
-            seen_bookmakers = set()
-            unique_bookmakers = []
-            for bm in prop_data["bookmakers"]:
-                bm_key = (bm["name"], bm["odds"])
-                if bm_key not in seen_bookmakers:
-                    seen_bookmakers.add(bm_key)
-                    unique_bookmakers.append(bm)
-            prop_data["bookmakers"] = unique_bookmakers
-            
+            del prop_data["_seen_bookmakers"]
+
             # Sort bookmakers by best odds (least negative)
-            prop_data["bookmakers"].sort(key=lambda x: x["odds"], reverse=True)
-            
+            prop_data["bookmakers"].sort(key=itemgetter("odds"), reverse=True)
+
             qualifying.append(prop_data)
         
-        # Update global data
-        with data_lock:
-            latest_props_data = {
-                "last_updated": datetime.now(ET).isoformat(),
-                "current_day": datetime.now(ET).strftime('%A, %B %d'),
-                "current_week": int(current_week),
-                "games": games_info,
-                "props": qualifying,
-                "summary": {
-                    "total_games": len(events_to_check),
-                    "total_props": len(qualifying),
-                    "odds_range": "-600 to -150",
-                    "min_games": "At least 4 consecutive games hit"
-                },
-                "error": None
-            }
-        
+        # Derived views computed once per refresh instead of per request
+        props_by_game = defaultdict(list)
+        for prop in qualifying:
+            props_by_game[prop["game"]].append(prop)
+
+        # Publish the new snapshot in a single rebind - readers are lock-free
+        now = datetime.now(ET)
+        publish_snapshot({
+            "last_updated": now.isoformat(),
+            "last_updated_formatted": now.strftime("%I:%M %p ET"),
+            "current_day": now.strftime('%A, %B %d'),
+            "current_week": int(current_week),
+            "games": games_info,
+            "props": qualifying,
+            "props_by_game": dict(props_by_game),
+            "summary": {
+                "total_games": len(events_to_check),
+                "total_props": len(qualifying),
+                "odds_range": "-600 to -150",
+                "min_games": "At least 4 consecutive games hit"
+            },
+            "error": None
+        })
+
         logger.info(f"Update complete! Found {len(qualifying)} qualifying props")
-        
+        _reschedule_poll(events_to_check)
+
     except Exception as e:
         logger.error(f"Error updating props: {str(e)}")
-        with data_lock:
-            latest_props_data["error"] = str(e)
-            latest_props_data["last_updated"] = datetime.now(ET).isoformat()
+        # Rebuild a full dict rather than mutating the published snapshot
+        now = datetime.now(ET)
+        publish_snapshot({
+            **latest_props_data,
+            "error": str(e),
+            "last_updated": now.isoformat(),
+            "last_updated_formatted": now.strftime("%I:%M %p ET")
+        }, good=False)
 
 @app.route('/')
 def index():
     """Main route returns JSON data"""
-    with data_lock:
-        data = latest_props_data.copy()
-    
-    # Format the last updated time
-    if data["last_updated"]:
-        dt = datetime.fromisoformat(data["last_updated"])
-        data["last_updated_formatted"] = dt.strftime("%I:%M %p ET")
+    # The payload only changes when a refresh publishes, so last_updated
+    # doubles as an ETag and lets clients revalidate with a bodyless 304
+    etag = latest_props_data.get("last_updated") or "never"
+    if request.headers.get("If-None-Match") == etag:
+        return app.response_class(status=304)
+
+    # The response bytes are pre-rendered (and pre-gzipped) at refresh time,
+    # so this is a zero-copy serve of the cached blob
+    if "gzip" in request.headers.get("Accept-Encoding", ""):
+        resp = app.response_class(latest_response_gzip, mimetype="application/json")
+        resp.headers["Content-Encoding"] = "gzip"
+        resp.headers["Vary"] = "Accept-Encoding"
     else:
-        data["last_updated_formatted"] = "Never"
-    
-    # Group props by game for better organization
-    if data.get("props"):
-        props_by_game = {}
-        for prop in data["props"]:
-            game = prop["game"]
-            if game not in props_by_game:
-                props_by_game[game] = []
-            props_by_game[game].append(prop)
-        data["props_by_game"] = props_by_game
-    
-    return jsonify(data)
+        resp = app.response_class(latest_response_bytes, mimetype="application/json")
+    resp.headers["ETag"] = etag
+    return resp
 
 @app.route('/props')
 def get_props():
     """Alias endpoint for props data"""
     return index()
 
+@app.after_request
+def set_cache_headers(response):
+    """Let browsers and proxies reuse the props payload between refreshes"""
+    if request.path in ("/", "/props"):
+        response.headers["Cache-Control"] = "public, max-age=300, stale-while-revalidate=1800"
+    return response
+
 @app.route('/health')
 def health():
     """Health check endpoint"""
-    return jsonify({
-        "status": "healthy", 
+    return app.response_class(orjson.dumps({
+        "status": "healthy",
         "last_updated": latest_props_data.get("last_updated"),
         "props_count": len(latest_props_data.get("props", []))
-    })
+    }), mimetype="application/json")
 
 def init_scheduler():
     """Initialize the background scheduler"""
+    global scheduler
     scheduler = BackgroundScheduler()
-    
-    # Run immediately on startup
-    fetch_nfl_props()
-    
-    # Schedule to run every 30 minutes
+
+    # Schedule to run every 30 minutes. next_run_time=now kicks the first
+    # refresh off immediately but in the scheduler thread, so Flask can bind
+    # its port without waiting ~30-60s for the network + pandas work.
+    # coalesce/max_instances keep a slow refresh from stacking up behind
+    # missed ticks.
     scheduler.add_job(
         func=fetch_nfl_props,
         trigger="interval",
         minutes=30,
         id='fetch_props',
         name='Fetch NFL Props',
-        replace_existing=True
+        replace_existing=True,
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=300,
+        next_run_time=datetime.now(ET)
     )
     
+    # Force a stats rebuild early each morning so the first game-day refresh
+    # doesn't pay the play-by-play download
+    scheduler.add_job(
+        func=refresh_weekly_stats,
+        trigger="cron",
+        hour=4,
+        timezone=ET,
+        id='refresh_weekly_stats',
+        name='Rebuild Weekly Stats Cache',
+        replace_existing=True
+    )
+
     scheduler.start()
     logger.info("Scheduler started - will update every 30 minutes")
 